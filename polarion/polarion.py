@@ -1,17 +1,25 @@
 import atexit
 import re
+import time
 from urllib.parse import urljoin, urlparse
 import requests
 import tempfile
 import os
-from zeep import Client, CachingClient
+import sqlite3
+from zeep import Client
+from zeep.cache import InMemoryCache, SqliteCache
 from zeep.plugins import HistoryPlugin
+from zeep.transports import Transport
 
 from .project import Project
 import logging
 logger = logging.getLogger(__name__)
 
 _baseServiceUrl = 'ws/services'
+_wsdlCacheEnvVar = 'POLARION_WSDL_CACHE'
+_wsdlCacheTimeout = 86400  # seconds
+_responseCacheTimeout = 300  # seconds
+_repeatableOperationPrefixes = ('get', 'query', 'generate')  # read only operations, safe to repeat
 
 
 class Polarion(object):
@@ -26,10 +34,13 @@ class Polarion(object):
     :param verify_certificate: Set to True/False to activate certification validation for TLS connection or provide string with link to certification chain (PEM & x264 encoded)
     :param svn_repo_url: Set to the correct url when the SVN repo is not accessible via <host>/repo. For example http://example/repo_extern
     :param proxy: Set to a proxy address to use a proxy, use the format: proxy='ip:port'
+    :param cache: Set to False to disable the persistent WSDL/XSD cache. The cache file is stored in the
+        user's cache directory (the zeep default) and can be moved with the POLARION_WSDL_CACHE environment variable.
+        When the file can't be used, the documents are cached in memory
     """
 
     def __init__(self, polarion_url, user, password=None, token=None, static_service_list=False, verify_certificate=True,
-                 svn_repo_url=None, proxy=None, request_session=None, cache=False):
+                 svn_repo_url=None, proxy=None, request_session=None, cache=True):
         self.user = user
         self.password = password
         self.token = token
@@ -40,6 +51,8 @@ class Polarion(object):
         self.proxy = None
         self.request_session = request_session
         self.cache = cache
+        self._wsdl_cache = None
+        self._response_cache = {}
         self.transport = None
         if proxy is not None:
             self.proxy = {
@@ -122,14 +135,28 @@ class Polarion(object):
                 'Cannot login because WSDL has no SessionWebService')
     
     def get_client(self,service,plugins=[]):
-        client = None
+        transport = None
         if self.cache:
-            client = CachingClient(self.services[service]['url'] + '?wsdl', plugins=plugins)
-        else:
-            client = Client(self.services[service]['url'] + '?wsdl', plugins=plugins)
+            transport = Transport(cache=self._getWsdlCache())
+        client = Client(self.services[service]['url'] + '?wsdl', plugins=plugins, transport=transport)
         client.transport.session.verify = self.verify_certificate
         return client
 
+    def _getWsdlCache(self):
+        """
+        Get the persistent cache for the WSDL and XSD documents, shared by all the service clients.
+        When the cache file can't be used, the documents are only cached in memory.
+        """
+        if self._wsdl_cache is None:
+            # without the environment variable, zeep's default location in the user's cache directory is used
+            path = os.environ.get(_wsdlCacheEnvVar)
+            try:
+                self._wsdl_cache = SqliteCache(path=path, timeout=_wsdlCacheTimeout)
+            except (OSError, sqlite3.Error) as err:
+                logger.warning(f'Cannot use the WSDL cache file, caching in memory instead: {err}')
+                self._wsdl_cache = InMemoryCache(timeout=_wsdlCacheTimeout)
+        return self._wsdl_cache
+
     def _updateServices(self):
         """
         Updates all services with the correct session ID
@@ -138,7 +165,9 @@ class Polarion(object):
             raise Exception('Cannot update services when not logged in')
         for service in self.services:
             if service != 'Session':
-                if 'client' not in service:
+                # Clients are kept across session renewals so that service handles cached by other objects stay
+                # valid, only their session header and cookies are refreshed
+                if 'client' not in self.services[service]:
                     self.services[service]['client'] = self.get_client(service)
                 self.services[service]['client'].set_default_soapheaders(
                     [self.sessionHeaderElement])
@@ -177,6 +206,7 @@ class Polarion(object):
         self.TestStepResultType = self.getTypeFromService('TestManagement', 'ns4:TestStepResult')
         self.TestRecordType = self.getTypeFromService('TestManagement', 'ns4:TestRecord')
         self.WorkItemType = self.getTypeFromService('Tracker', 'ns2:WorkItem')
+        self.WorkItemFields = tuple(name for name, _ in self.WorkItemType.elements)
         self.LinkedWorkItemType = self.getTypeFromService('Tracker', 'ns2:LinkedWorkItem')
         self.LinkedWorkItemArrayType = self.getTypeFromService('Tracker', 'ns2:ArrayOfLinkedWorkItem')
         self.ArrayOfCustomType = self.getTypeFromService('Tracker', 'ns2:ArrayOfCustom')
@@ -212,6 +242,28 @@ class Polarion(object):
     def getService(self, name: str):
         """
         Get a WSDL service client. The name can be 'Tracker' or 'Session'
+        The returned service proxy is shared between all callers, and remains valid after a session renewal.
+        """
+        self._renewSessionIfExpired()
+
+        if name in self.services:
+            return self.services[name]['client'].service
+        else:
+            raise Exception('Service does not exsist')
+
+    def getRenewingService(self, name: str):
+        """
+        Get a WSDL service client that can be kept for a long time. Unlike getService, the session is not checked
+        before each call, but when a call fails. If the session had expired, a new one is started and read only
+        operations are repeated once. Other operations are not repeated as the server may have executed them.
+        """
+        return RenewingService(self, name)
+
+    def _renewSessionIfExpired(self):
+        """
+        Checks if the session is still valid and starts a new one if not.
+
+        :return: True when a new session was started
         """
         # request user info to see if we're still logged in
         try:
@@ -219,11 +271,24 @@ class Polarion(object):
         except Exception:
             # if not, create a new session
             self._createSession()
+            return True
+        return False
 
-        if name in self.services:
-            return self.services[name]['client'].service
-        else:
-            raise Exception('Service does not exsist')
+    def getCachedResponse(self, key, request):
+        """
+        Get the response of a service request that rarely changes, like the project configuration.
+        The response is kept for 5 minutes and shared by all the objects using this client.
+
+        :param key: Hashable key identifying the request
+        :param request: Callable doing the request, used when there is no valid response cached
+        :return: The response of the request
+        """
+        now = time.monotonic()
+        cached = self._response_cache.get(key)
+        if cached is None or now - cached[0] > _responseCacheTimeout:
+            cached = (now, request())
+            self._response_cache[key] = cached
+        return cached[1]
 
     def getTypeFromService(self, name: str, type_name):
         """
@@ -277,7 +342,8 @@ class Polarion(object):
         if not field_order:
             field_order = ['id']
 
-        client = self.getClient('Tracker')
+        self.getService('Tracker')  # makes sure the session is still valid
+        client = self.services['Tracker']['client']
 
         with client.settings(strict=False):
             return client.service.generateHistory(uri, ignored_fields, field_order)
@@ -287,3 +353,34 @@ class Polarion(object):
 
     def __str__(self):
         return f'Polarion client for {self.url} with user {self.user}'
+
+
+class RenewingService(object):
+    """
+    Wrapper of a WSDL service client, see Polarion.getRenewingService
+
+    :param polarion: The polarion client
+    :param name: The name of the service, for example 'Tracker'
+    """
+
+    def __init__(self, polarion, name):
+        self._polarion = polarion
+        self._service = polarion.getService(name)
+
+    def __getattr__(self, operation):
+        if operation.startswith('_'):
+            # also reached by copy and pickle before __init__ has run, _service can't be used then
+            raise AttributeError(operation)
+        method = getattr(self._service, operation)
+
+        def call(*args, **kwargs):
+            try:
+                return method(*args, **kwargs)
+            except Exception:
+                # the failure may have happened after the server executed the call, so only read only operations
+                # are repeated. The session is renewed in any case, for the next calls.
+                if self._polarion._renewSessionIfExpired() and operation.startswith(_repeatableOperationPrefixes):
+                    return method(*args, **kwargs)
+                raise
+
+        return call
@@ -1,11 +1,15 @@
-import copy
+import mmap
 import os
+import re
+from contextlib import contextmanager
+from functools import cached_property
 from datetime import datetime, date
 from enum import Enum
 from collections import namedtuple
 from typing import Iterable
 
 from zeep import xsd
+from zeep.helpers import serialize_object
 
 from .test_table import TestTable
 from .base.comments import Comments
@@ -15,6 +19,46 @@ from .user import User
 
 LinkedWorkitem = namedtuple('LinkedWorkitem', ['role', 'uri'])
 
+_bulkLoadChunkSize = 200  # Maximum number of ids per query, keeps the query string within server limits
+_immutableTypes = (str, int, float, bool, type(None), datetime, date)  # field values that can't be changed in place
+_workitemUriPattern = re.compile(r'/default/(?P<project_id>[^/$]+)\$\{WorkItem\}(?P<id>[^%]+)$')
+
+
+@contextmanager
+def _openAttachment(file_path):
+    """
+    Open a file to be uploaded as attachment. The file is memory mapped instead of read, so that only its base64
+    encoded copy, made while building the request, is held in memory.
+
+    :param file_path: The file to open
+    :return: A bytes like object with the file content
+    """
+    with open(file_path, "rb") as file_content:
+        if os.fstat(file_content.fileno()).st_size == 0:
+            yield b''  # empty files can't be mapped
+        else:
+            with mmap.mmap(file_content.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                yield data
+
+
+def _linkRole(linked_item):
+    """
+    Returns the role id of a linked workitem, or 'NA' when it has no role.
+    """
+    try:
+        return linked_item.role.id
+    except AttributeError:
+        return 'NA'
+
+
+def _fingerprint(value):
+    """
+    Returns a fingerprint of a field value, used to detect changes without keeping a copy of the value.
+    The representation of zeep objects includes all their nested values, so computing it still walks the complete
+    value. It is about twice as fast as a deep copy and does not keep the copy in memory.
+    """
+    return hash(repr(value))
+
 
 class Workitem(CustomFields, Comments):
     """
@@ -39,23 +83,28 @@ class Workitem(CustomFields, Comments):
         INTERNAL_REF = 'internal reference'
         EXTERNAL_REF = 'external reference'
 
+    # cached properties derived from the polarion data, they are dropped when the workitem is reloaded
+    _reload_invalidated = ('_allowed_custom_keys', '_available_status')
+
     def __init__(self, polarion, project=None, id=None, uri=None, new_workitem_type=None, new_workitem_fields=None,
                  polarion_workitem=None):
 
         super().__init__(polarion, project, id, uri)
+        self._dirty_fields = set()  # Fields that may have been changed since the last (re)load, see save()
+        self._original_values = {}  # Fingerprints of the fields as loaded, taken when they are first accessed
+        del self.customFields  # Like all the other fields, it is projected from the polarion data on first access
         self._polarion = polarion
         self._project = project
         # self._id = id  # This is already done by the super class
         # self._uri = uri  #  This is already done by the super class
         self._postpone_save = False
+        self._reload_pending = False  # Set by _reloadFromPolarion(), the data is fetched on the next access
         self._legacy_test_steps_table = None  # Kept to support legacy code : addTestStep, removeTestStep,
         # updateTestStep, etc...
 
-        service = self._polarion.getService('Tracker')
-
         if self._uri:
             try:
-                self._polarion_item = service.getWorkItemByUri(self._uri)
+                self._polarion_item = self._tracker.getWorkItemByUri(self._uri)
             except Exception as err:
                 raise PolarionAccessError(
                     f'Cannot load workitem {self._uri} within Polarion server {self._polarion.polarion_url}\n'
@@ -66,7 +115,7 @@ class Workitem(CustomFields, Comments):
             if self._project is None:
                 raise PolarionAccessError(f'Provide a project when creating a workitem from an id')
             try:
-                self._polarion_item = service.getWorkItemById(
+                self._polarion_item = self._tracker.getWorkItemById(
                     self._project.id, self.id)
             except Exception as e:
                 raise PolarionAccessError(
@@ -81,7 +130,7 @@ class Workitem(CustomFields, Comments):
             self._polarion_item.project = self._project.polarion_data
 
             # get the required field for a new item
-            required_features = service.getInitialWorkflowActionForProjectAndType(self._project.id, self._polarion.EnumOptionIdType(id=new_workitem_type))
+            required_features = self._tracker.getInitialWorkflowActionForProjectAndType(self._project.id, self._polarion.EnumOptionIdType(id=new_workitem_type))
             if required_features.requiredFeatures is not None:
                 # if there are any, go and check if they are all supplied
                 if new_workitem_fields is None or not set(required_features.requiredFeatures.item) <= new_workitem_fields.keys():
@@ -96,10 +145,10 @@ class Workitem(CustomFields, Comments):
                         raise PolarionWorkitemAttributeError(f'{new_field} in new_workitem_fields is not recognised as a workitem field')
 
             # and create it
-            new_uri = service.createWorkItem(self._polarion_item)
-            # reload from polarion
-            self._polarion_item = service.getWorkItemByUri(new_uri)
-            self._id = self._polarion_item.id
+            self._uri = self._tracker.createWorkItem(self._polarion_item)
+            # the content, including the id, is loaded from polarion on first access
+            del self._polarion_item
+            self._reload_pending = True
 
         elif polarion_workitem is not None:
             self._polarion_item = polarion_workitem
@@ -112,7 +161,44 @@ class Workitem(CustomFields, Comments):
             polarion_project_id = self._polarion_item.project.id
             self._project = polarion.getProject(polarion_project_id)
 
-        self._buildWorkitemFromPolarion()
+        if not self._reload_pending:
+            self._buildWorkitemFromPolarion()
+
+    @classmethod
+    def bulk_load(cls, polarion, project, ids, fields=None):
+        """
+        Load several workitems of a project at once. Instead of one request per workitem, the workitems are
+        retrieved with one query per chunk of ids.
+
+        :param polarion: Polarion client object
+        :param project: Polarion Project object
+        :param ids: Iterable of workitem IDs
+        :param fields: List of fields to retrieve. When not given all the workitem fields are retrieved.
+        :return: The workitems in the same order as the ids
+        :rtype: Workitem[]
+        """
+        ids = list(ids)
+        if fields is None:
+            fields = list(polarion.WorkItemFields)
+        service = polarion.getService('Tracker')
+
+        polarion_workitems = {}
+        for start in range(0, len(ids), _bulkLoadChunkSize):
+            chunk = ids[start:start + _bulkLoadChunkSize]
+            query = f'project.id:{project.id} AND id:({" OR ".join(chunk)})'
+            try:
+                for polarion_workitem in service.queryWorkItems(query, 'id', fields):
+                    polarion_workitems[polarion_workitem.id] = polarion_workitem
+            except Exception as e:
+                raise PolarionAccessError(
+                    f'Error loading workitems in project "{project.id}"'
+                    f' on server "{polarion.polarion_url}":\n{e}')
+
+        missing = [_id for _id in ids if _id not in polarion_workitems]
+        if len(missing) > 0:
+            raise PolarionAccessError(f'Workitems {missing} not found in project "{project.id}"'
+                                      f' on server "{polarion.polarion_url}"')
+        return [cls(polarion, project, polarion_workitem=polarion_workitems[_id]) for _id in ids]
 
     @property
     def url(self):
@@ -134,6 +220,16 @@ class Workitem(CustomFields, Comments):
             return None
         return '/'.join(location_split[start+1:stop])
 
+    @cached_property
+    def _tracker(self):
+        """Tracker service, resolved once per workitem. The session is renewed when a call fails on it"""
+        return self._polarion.getRenewingService('Tracker')
+
+    @cached_property
+    def _test_service(self):
+        """TestManagement service, resolved once per workitem. The session is renewed when a call fails on it"""
+        return self._polarion.getRenewingService('TestManagement')
+
     def __enter__(self):
         self._postpone_save = True
         return self
@@ -143,12 +239,14 @@ class Workitem(CustomFields, Comments):
         self.save()
 
     def _buildWorkitemFromPolarion(self):
+        """
+        Check the polarion data and take the reference for detecting changes.
+        The fields are not copied here, they become attributes of the workitem on first access, see __getattr__().
+        Their fingerprint is taken then, only the fields kept while the save is postponed are fingerprinted here.
+        """
         if self._polarion_item is not None and not self._polarion_item.unresolvable:
-            self._original_polarion = copy.deepcopy(self._polarion_item)  # Refreshes the cache
-            if self._postpone_save is False:  # This will avoid that the data set be lost.
-                for attr, value in self._polarion_item.__dict__.items():
-                    for key in value:
-                        setattr(self, key, value[key])
+            self._original_values = {key: _fingerprint(self._polarion_item[key])  # Refreshes the cache
+                                     for key in self._polarion_item if key in self.__dict__}
         else:
             raise PolarionAccessError(f'Workitem "{self._id}" not retrieved from Polarion'
                                       f' {self._polarion.polarion_url}')
@@ -170,7 +268,7 @@ class Workitem(CustomFields, Comments):
 
         :param user: The user object to remove
         """
-        service = self._polarion.getService('Tracker')
+        service = self._tracker
         service.removeApprovee(self.uri, user.id)
         self._reloadFromPolarion()
 
@@ -181,7 +279,7 @@ class Workitem(CustomFields, Comments):
         :param user: The user object to add
         :param remove_others: Set to True to make the new user the only approver user.
         """
-        service = self._polarion.getService('Tracker')
+        service = self._tracker
 
         if remove_others:
             current_users = self.getApproverUsers()
@@ -198,11 +296,9 @@ class Workitem(CustomFields, Comments):
         :return: An array of User objects
         :rtype: User[]
         """
-        assigned_users = []
         if self.approvals is not None:
-            for approval in self.approvals.Approval:
-                assigned_users.append(User(self._polarion, approval.user))
-        return assigned_users
+            return [User(self._polarion, approval.user) for approval in self.approvals.Approval]
+        return []
 
     def getAssignedUsers(self):
         """
@@ -211,12 +307,10 @@ class Workitem(CustomFields, Comments):
         :return: An array of User objects
         :rtype: User[]
         """
-        assigned_users = []
         if self.assignee is not None:
-            for user in self.assignee.User:
-                if user is not None and user.unresolvable is False:
-                    assigned_users.append(User(self._polarion, user))
-        return assigned_users
+            return [User(self._polarion, user) for user in self.assignee.User
+                    if user is not None and user.unresolvable is False]
+        return []
 
     def removeAssignee(self, user: User):
         """
@@ -224,7 +318,7 @@ class Workitem(CustomFields, Comments):
 
         :param user: The user object to remove
         """
-        service = self._polarion.getService('Tracker')
+        service = self._tracker
         service.removeAssignee(self.uri, user.id)
         self._reloadFromPolarion()
 
@@ -235,7 +329,7 @@ class Workitem(CustomFields, Comments):
         :param user: The user object to add
         :param remove_others: Set to True to make the new user the only assigned user.
         """
-        service = self._polarion.getService('Tracker')
+        service = self._tracker
 
         if remove_others:
             current_users = self.getAssignedUsers()
@@ -295,8 +389,7 @@ class Workitem(CustomFields, Comments):
         :rtype: string[]
         """
         try:
-            service = self._polarion.getService('Tracker')
-            return service.getCustomFieldKeys(self.uri)
+            return list(self._getCustomFieldKeys())
         except Exception:
             return []
 
@@ -307,7 +400,15 @@ class Workitem(CustomFields, Comments):
         :return: If the field is allowed
         :rtype: bool
         """
-        return key in self.getAllowedCustomKeys()
+        try:
+            return key in self._allowed_custom_keys
+        except Exception:
+            return False  # nothing is cached then, the next check asks again
+
+    @cached_property
+    def _allowed_custom_keys(self):
+        """Set of the allowed custom keys, kept until the workitem is reloaded. Request errors are raised."""
+        return frozenset(self._getCustomFieldKeys())
 
     def getAvailableStatus(self):
         """
@@ -316,12 +417,8 @@ class Workitem(CustomFields, Comments):
         :return: An array of string of the statusses
         :rtype: string[]
         """
-        available_status = []
-        service = self._polarion.getService('Tracker')
-        av_status = service.getAvailableEnumOptionIdsForId(self.uri, 'status')
-        for status in av_status:
-            available_status.append(status.id)
-        return available_status
+        service = self._tracker
+        return [status.id for status in service.getAvailableEnumOptionIdsForId(self.uri, 'status')]
 
     def getAvailableActionsDetails(self):
         """
@@ -330,12 +427,8 @@ class Workitem(CustomFields, Comments):
         :return: An array of dictionaries of the actions
         :rtype: dict[]
         """
-        available_actions = []
-        service = self._polarion.getService('Tracker')
-        av_actions = service.getAvailableActions(self.uri)
-        for action in av_actions:
-            available_actions.append(action)
-        return available_actions
+        service = self._tracker
+        return list(service.getAvailableActions(self.uri))
 
     def getAvailableActions(self):
         """
@@ -344,12 +437,8 @@ class Workitem(CustomFields, Comments):
         :return: An array of strings of the actions
         :rtype: string[]
         """
-        available_actions = []
-        service = self._polarion.getService('Tracker')
-        av_actions = service.getAvailableActions(self.uri)
-        for action in av_actions:
-            available_actions.append(action.nativeActionId)
-        return available_actions
+        service = self._tracker
+        return [action.nativeActionId for action in service.getAvailableActions(self.uri)]
 
     def performAction(self, action_name):
         """
@@ -357,12 +446,14 @@ class Workitem(CustomFields, Comments):
 
         :param action_name: string containing the action name
         """
-        # get id from action name
-        service = self._polarion.getService('Tracker')
-        av_actions = service.getAvailableActions(self.uri)
-        for action in av_actions:
-            if action.nativeActionId == action_name or action.actionName == action_name:
-                service.performWorkflowAction(self.uri, action.actionId)
+        # get id from action name, only the first action matching the name is performed
+        service = self._tracker
+        action_ids = {}
+        for action in service.getAvailableActions(self.uri):
+            action_ids.setdefault(action.nativeActionId, action.actionId)
+            action_ids.setdefault(action.actionName, action.actionId)
+        if action_name in action_ids:
+            service.performWorkflowAction(self.uri, action_ids[action_name])
 
     def performActionId(self, actionId: int):
         """
@@ -370,7 +461,7 @@ class Workitem(CustomFields, Comments):
 
         :param actionId: number for the action to perform
         """
-        service = self._polarion.getService('Tracker')
+        service = self._tracker
         service.performWorkflowAction(self.uri, actionId)
 
     def setStatus(self, status):
@@ -379,10 +470,18 @@ class Workitem(CustomFields, Comments):
 
         :param status: name of the status
         """
-        if status in self.getAvailableStatus():
+        if self.status is not None and self.status.id == status:
+            # nothing to change, save() only sends the other pending changes, if any
+            self.save()
+        elif status in self._available_status:
             self.status.id = status
             self.save()
 
+    @cached_property
+    def _available_status(self):
+        """Set of the available status, kept until the workitem is reloaded"""
+        return frozenset(self.getAvailableStatus())
+
     def getStatusId(self):
         return self.status.id
 
@@ -470,7 +569,7 @@ class Workitem(CustomFields, Comments):
             try:
                 # get the custom fields
                 if self._hasTestStepField():
-                    service_test = self._polarion.getService('TestManagement')
+                    service_test = self._test_service
                     return service_test.getTestSteps(self.uri)
             except Exception as  e:
                 # fail silently as there are probably not test steps for this workitem
@@ -508,14 +607,14 @@ class Workitem(CustomFields, Comments):
                         step.values.Text[col].content = ''  # Get rid of None values. They are not allowed in Polarion,
                         # but polarion converts '' into None, so we need to convert it back
 
-        service_test = self._polarion.getService('TestManagement')
+        service_test = self._test_service
         service_test.setTestSteps(self.uri, test_steps)
 
     def getTestRuns(self, limit=-1):
         if not self._hasTestStepField():
             return None
 
-        client = self._polarion.getService('TestManagement')
+        client = self._test_service
         polarion_test_runs = client.searchTestRunsWithFieldsLimited(self.id, 'Created', ['id'], limit)
 
         return [test_run.uri for test_run in polarion_test_runs]
@@ -527,7 +626,7 @@ class Workitem(CustomFields, Comments):
         :param url: The URL to add
         :param hyperlink_type: Select internal or external hyperlink. Can be a string for custom link types.
         """
-        service = self._polarion.getService('Tracker')
+        service = self._tracker
         if isinstance(hyperlink_type, Enum):  # convert Enum to str
             hyperlink_type = hyperlink_type.value
         service.addHyperlink(self.uri, url, {'id': hyperlink_type})
@@ -539,7 +638,7 @@ class Workitem(CustomFields, Comments):
         @param url: url to remove
         @return:
         """
-        service = self._polarion.getService('Tracker')
+        service = self._tracker
         service.removeHyperlink(self.uri, url)
         self._reloadFromPolarion()
 
@@ -551,7 +650,7 @@ class Workitem(CustomFields, Comments):
             :param link_type: The link type
         """
 
-        service = self._polarion.getService('Tracker')
+        service = self._tracker
         service.addLinkedItem(self.uri, workitem.uri, role={'id': link_type})
         self._reloadFromPolarion()
         workitem._reloadFromPolarion()
@@ -565,7 +664,7 @@ class Workitem(CustomFields, Comments):
         :param role: the role to remove
         :return: None
         """
-        service = self._polarion.getService('Tracker')
+        service = self._tracker
         if role is not None:
             service.removeLinkedItem(self.uri, workitem.uri, role={'id': role})
         else:
@@ -587,7 +686,7 @@ class Workitem(CustomFields, Comments):
         @return: Array of tuple ('link type', Workitem)
         """
         linked_items = []
-        service = self._polarion.getService('Tracker')
+        service = self._tracker
         if self.linkedWorkItems is not None:
             for linked_item in self.linkedWorkItems.LinkedWorkItem:
                 if linked_item.role is not None:
@@ -626,7 +725,7 @@ class Workitem(CustomFields, Comments):
         :return: list of bytes
         :rtype: bytes
         """
-        service = self._polarion.getService('Tracker')
+        service = self._tracker
         return service.getAttachment(self.uri, id)
 
     def getAttachments(self) -> list:
@@ -669,7 +768,7 @@ class Workitem(CustomFields, Comments):
 
         :param id: The attachment id
         """
-        service = self._polarion.getService('Tracker')
+        service = self._tracker
         service.deleteAttachment(self.uri, id)
         self._reloadFromPolarion()
 
@@ -680,10 +779,10 @@ class Workitem(CustomFields, Comments):
         :param file_path: Source file to upload
         :param title: The title of the attachment
         """
-        service = self._polarion.getService('Tracker')
+        service = self._tracker
         file_name = os.path.split(file_path)[1]
-        with open(file_path, "rb") as file_content:
-            service.createAttachment(self.uri, file_name, title, file_content.read())
+        with _openAttachment(file_path) as data:
+            service.createAttachment(self.uri, file_name, title, data)
         self._reloadFromPolarion()
 
     def addAttachmentData(self, data, title, file_name):
@@ -695,7 +794,7 @@ class Workitem(CustomFields, Comments):
         :param title: The title of the attachment
         :param file_name: The name of the file
         """
-        service = self._polarion.getService('Tracker')
+        service = self._tracker
         service.createAttachment(self.uri, file_name, title, data)
         self._reloadFromPolarion()
 
@@ -707,10 +806,10 @@ class Workitem(CustomFields, Comments):
         :param file_path: Source file to upload
         :param title: The title of the attachment
         """
-        service = self._polarion.getService('Tracker')
+        service = self._tracker
         file_name = os.path.split(file_path)[1]
-        with open(file_path, "rb") as file_content:
-            service.updateAttachment(self.uri, id, file_name, title, file_content.read())
+        with _openAttachment(file_path) as data:
+            service.updateAttachment(self.uri, id, file_name, title, data)
         self._reloadFromPolarion()
 
     def updateAttachmentData(self, id, data, title, file_name) -> None:
@@ -726,7 +825,7 @@ class Workitem(CustomFields, Comments):
         :param title: The title of the attachment
         :type title: str
         """
-        service = self._polarion.getService('Tracker')
+        service = self._tracker
         service.updateAttachment(self.uri, id, file_name, title, data)
         self._reloadFromPolarion()
 
@@ -758,7 +857,7 @@ class Workitem(CustomFields, Comments):
         :return: Nothing
         :rtype: None
         """
-        service = self._polarion.getService('Tracker')
+        service = self._tracker
         service.deleteWorkItem(self.uri)
 
     def moveToDocument(self, document, parent, order=-1):
@@ -770,7 +869,7 @@ class Workitem(CustomFields, Comments):
         :param order: Order of the workitem, -1 for last
         :type order: int
         """
-        service = self._polarion.getService('Tracker')
+        service = self._tracker
         service.moveWorkItemToDocument(self.uri, document.uri, parent.uri if parent is not None else xsd.const.Nil,
                                        order, False)
 
@@ -855,7 +954,7 @@ class Workitem(CustomFields, Comments):
         if hasattr(self, 'revision_number'):
             return self.revision_number
 
-        service = self._polarion.getService('Tracker')
+        service = self._tracker
         try:
             history: list = service.getRevisions(self.uri)
             self.revision_number = int(history[-1])
@@ -868,24 +967,36 @@ class Workitem(CustomFields, Comments):
         Return a list of coulmn headers
         @return: [str]
         """
-        columns = []
-        service = self._polarion.getService('TestManagement')
-        config = service.getTestStepsConfiguration(self._project.id)
-        for col in config:
-            columns.append(col.name)
-        return columns
+        return list(self._getTestStepConfig()[0])
 
     def _getConfiguredTestStepColumnIDs(self):
         """
         Return a list of column header IDs.
         @return: [str]
         """
-        columns = []
-        service = self._polarion.getService('TestManagement')
-        config = service.getTestStepsConfiguration(self._project.id)
-        for col in config:
-            columns.append(col.id)
-        return columns
+        return list(self._getTestStepConfig()[1])
+
+    def _getTestStepConfig(self):
+        """
+        Return the names and IDs of the test step columns configured in the project. They are obtained with a single
+        request and cached by the polarion client.
+        @return: ((str), (str))
+        """
+        def request():
+            config = self._test_service.getTestStepsConfiguration(self._project.id)
+            return tuple(col.name for col in config), tuple(col.id for col in config)
+
+        return self._polarion.getCachedResponse(('getTestStepConfig', self._project.id), request)
+
+    def _getCustomFieldKeys(self):
+        """
+        Return the custom field keys of the workitem. These depend on the project and the workitem type, so they are
+        cached by the polarion client for all the workitems of the same type, as a tuple so it can't be modified.
+        @return: (str)
+        """
+        return self._polarion.getCachedResponse(
+            ('getCustomFieldKeys', self._project.id, self.getTypeId()),
+            lambda: tuple(self._tracker.getCustomFieldKeys(self.uri)))
 
     def _testStepNoneCheck(self):
         """
@@ -903,8 +1014,7 @@ class Workitem(CustomFields, Comments):
         Checks if the testSteps custom field is available for this workitem. If so it allows test steps to be added.
         @return: True when test steps are available
         """
-        service = self._polarion.getService('Tracker')
-        custom_fields = service.getCustomFieldKeys(self.uri)
+        custom_fields = self._getCustomFieldKeys()
         if 'testSteps' in custom_fields:
             return True
         return False
@@ -915,17 +1025,23 @@ class Workitem(CustomFields, Comments):
         """
         if self._postpone_save:
             return
+        if len(self._dirty_fields) == 0:
+            return
+        self._loadPendingReload()  # the changes are relative to the current polarion data
         updated_item = {}
 
-        for attr, value in self._polarion_item.__dict__.items():
-            for key in value:
-                current_value = getattr(self, key)
-                prev_value = getattr(self._original_polarion, key)
-                if current_value != prev_value:
+        for key in self._dirty_fields:
+            if key in self._polarion_item and key in self.__dict__:
+                current_value = self.__dict__[key]
+                original = self._original_values.get(key)
+                if original is None:
+                    # assigned without being read, the polarion data still holds the original value
+                    original = _fingerprint(self._polarion_item[key])
+                if _fingerprint(current_value) != original:
                     updated_item[key] = current_value
         if len(updated_item) > 0:
             updated_item['uri'] = self.uri
-            service = self._polarion.getService('Tracker')
+            service = self._tracker
             service.updateWorkItem(updated_item)
             self._reloadFromPolarion()
 
@@ -949,9 +1065,10 @@ class Workitem(CustomFields, Comments):
             return self.lastFinalized
 
         try:
-            history = self._polarion.generateHistory(self.uri, ignored_fields=[f for f in dir(self._polarion_item) if f not in ['status']])
+            ignored_fields = [field for field in self._polarion.WorkItemFields if field != 'status']
+            history = self._polarion.generateHistory(self.uri, ignored_fields=ignored_fields)
 
-            for h in history[::-1]:
+            for h in reversed(history):
                 if h.diffs:
                     for d in h.diffs.item:
                         if d.fieldName == 'status' and d.after.id == 'finalized':
@@ -963,114 +1080,192 @@ class Workitem(CustomFields, Comments):
         return None
 
     class WorkItemIterator:
-        """Workitem iterator for linked and backlinked workitems"""
+        """
+        Workitem iterator for linked and backlinked workitems.
+        When prefetch is set, all the linked workitems are loaded at once on the first iteration, and Workitem
+        objects are returned instead of LinkedWorkitem tuples.
+        """
 
-        def __init__(self, polarion, linkedWorkItems, roles: Iterable = None):
+        def __init__(self, polarion, linkedWorkItems, roles: Iterable = None, prefetch=False):
             self._polarion = polarion
             self._linkedWorkItems = linkedWorkItems
-            self._index = 0
+            self._prefetch = prefetch
+            self._prefetched = None
             self._disallowed_roles = None
             self._allowed_roles = None
             if roles is not None:
                 roles = (roles,) if isinstance(roles, str) else roles
-                for role in roles:
-                    if role.startswith('~'):
-                        if self._disallowed_roles is None:
-                            self._disallowed_roles = []
-                        self._disallowed_roles.append(role[1:])
-                    else:
-                        if self._allowed_roles is None:
-                            self._allowed_roles = []
-                        self._allowed_roles.append(role)
+                disallowed_roles = [role[1:] for role in roles if role.startswith('~')]
+                allowed_roles = [role for role in roles if not role.startswith('~')]
+                if len(disallowed_roles) > 0:
+                    self._disallowed_roles = frozenset(disallowed_roles)
+                if len(allowed_roles) > 0:
+                    self._allowed_roles = frozenset(allowed_roles)
+            self._links = self._filteredLinks()
 
         def __iter__(self):
             return self
 
-        def __next__(self) -> LinkedWorkitem:
-            if self._linkedWorkItems is None:
-                raise StopIteration
+        def __next__(self):
+            if self._prefetch:
+                if self._prefetched is None:
+                    self._prefetched = iter(self._loadLinkedWorkitems())
+                return next(self._prefetched)
+            return next(self._links)
+
+        def _filteredLinks(self):
+            """
+            Returns a generator of the LinkedWorkitem that pass the role filter. The generator is specialized for the
+            filter in use, so that the iteration does not check which filters are set for each link.
+            """
             try:
-                while True:
-                    if self._index < len(self._linkedWorkItems.LinkedWorkItem):
-                        obj = self._linkedWorkItems.LinkedWorkItem[self._index]
-                        self._index += 1
+                linked_items = self._linkedWorkItems.LinkedWorkItem
+            except AttributeError:  # no links
+                return iter(())
+            links = (LinkedWorkitem(_linkRole(obj), obj.workItemURI) for obj in linked_items)
+
+            allowed_roles = self._allowed_roles
+            disallowed_roles = self._disallowed_roles
+            if allowed_roles is None and disallowed_roles is None:
+                return links
+            elif disallowed_roles is None:
+                return (link for link in links if link.role in allowed_roles)
+            elif allowed_roles is None:
+                return (link for link in links if link.role not in disallowed_roles)
+            else:
+                return (link for link in links if link.role in allowed_roles and link.role not in disallowed_roles)
 
-                        try:
-                            role = obj.role.id
-                        except AttributeError:
-                            role = 'NA'
+        def _loadLinkedWorkitems(self):
+            """
+            Load all the remaining linked workitems. The workitems are fetched with one query per project, only the
+            uris that can't be split into project and id are loaded one by one.
+            """
+            uris = [link.uri for link in self._links]
 
-                        uri = obj.workItemURI
+            ids_per_project = {}
+            for uri in uris:
+                match = _workitemUriPattern.search(uri)
+                if match is not None:
+                    ids_per_project.setdefault(match.group('project_id'), []).append(match.group('id'))
 
-                        if (self._disallowed_roles is None or role not in self._disallowed_roles) and \
-                           (self._allowed_roles is None or role in self._allowed_roles):
-                            return LinkedWorkitem(role, uri)
-                    else:
-                        raise StopIteration
+            workitems = {}
+            for project_id, ids in ids_per_project.items():
+                project = self._polarion.getProject(project_id)
+                for workitem in Workitem.bulk_load(self._polarion, project, ids):
+                    workitems[workitem.uri] = workitem
+            return [workitems[uri] if uri in workitems else Workitem(self._polarion, uri=uri) for uri in uris]
+
+    def iterateLinkedWorkItems(self, roles: Iterable = None, prefetch=False) -> WorkItemIterator:
+        """
+        Iterate over the linked workitems.
 
-            except IndexError:
-                raise StopIteration
-            except AttributeError:
-                raise StopIteration
+        :param roles: Roles to include, a role starting with '~' is excluded instead
+        :param prefetch: Set to True to iterate over Workitem objects, all loaded at once, instead of LinkedWorkitem.
+            PolarionAccessError is raised when any of them can't be loaded
+        """
+        return Workitem.WorkItemIterator(self._polarion, self._polarion_item.linkedWorkItems, roles=roles,
+                                         prefetch=prefetch)
 
-    def iterateLinkedWorkItems(self, roles: Iterable = None) -> WorkItemIterator:
-        return Workitem.WorkItemIterator(self._polarion, self._polarion_item.linkedWorkItems, roles=roles)
+    def iterateLinkedWorkItemsDerived(self, roles: Iterable = None, prefetch=False) -> WorkItemIterator:
+        """
+        Iterate over the back linked workitems.
 
-    def iterateLinkedWorkItemsDerived(self, roles: Iterable = None) -> WorkItemIterator:
-        return Workitem.WorkItemIterator(self._polarion, self._polarion_item.linkedWorkItemsDerived, roles=roles)
+        :param roles: Roles to include, a role starting with '~' is excluded instead
+        :param prefetch: Set to True to iterate over Workitem objects, all loaded at once, instead of LinkedWorkitem.
+            PolarionAccessError is raised when any of them can't be loaded
+        """
+        return Workitem.WorkItemIterator(self._polarion, self._polarion_item.linkedWorkItemsDerived, roles=roles,
+                                         prefetch=prefetch)
 
     def _reloadFromPolarion(self):
-        service = self._polarion.getService('Tracker')
-        self._polarion_item = service.getWorkItemByUri(self._polarion_item.uri)
-        self._buildWorkitemFromPolarion()
-        # deepcopy was removed from here because it was already being done in
-        # _buildWorkitemFromPolarion() method
+        """
+        Mark the workitem to be reloaded from Polarion. The request to the server is only made on the next access to
+        its data, so that consecutive modifications do not each cause a reload.
+        """
+        if self._postpone_save is False:
+            # unsaved changes are dropped, also when a reload is already pending
+            self._dirty_fields.clear()
+            for key in self._polarion.WorkItemFields:
+                if key not in ('id', 'uri'):  # these don't change and are needed to reach the server
+                    self.__dict__.pop(key, None)
+        if self._reload_pending:
+            return
+        for name in self._reload_invalidated:
+            self.__dict__.pop(name, None)
+        self._uri = self._polarion_item.uri
+        del self._polarion_item
+        self._reload_pending = True
+
+    def _loadPendingReload(self):
+        """
+        Execute the reload requested by _reloadFromPolarion(), if any.
+        """
+        if self._reload_pending:
+            self._polarion_item = self._tracker.getWorkItemByUri(self._uri)
+            self._id = self._polarion_item.id
+            self._buildWorkitemFromPolarion()
+            self._reload_pending = False
+
+    def _attributes(self):
+        """
+        Returns all the attributes of the workitem, including the fields that were not accessed yet.
+        """
+        self._loadPendingReload()
+        attributes = {key: self._polarion_item[key] for key in self._polarion_item}
+        attributes.update(vars(self))
+        return attributes
+
+    def __getattr__(self, name):
+        attributes = self.__dict__
+        if attributes.get('_reload_pending', False):
+            self._loadPendingReload()
+            return getattr(self, name)
+        polarion_item = attributes.get('_polarion_item')
+        if polarion_item is not None and not name.startswith('_') and name in polarion_item:
+            # project the field as an attribute, the next accesses won't go through __getattr__
+            value = polarion_item[name]
+            attributes[name] = value
+            if not isinstance(value, _immutableTypes):
+                self._dirty_fields.add(name)  # it can be changed in place
+                self._original_values[name] = _fingerprint(value)
+            return value
+        return super().__getattr__(name)
+
+    def __setattr__(self, name, value):
+        if not name.startswith('_') and '_dirty_fields' in self.__dict__:
+            self._dirty_fields.add(name)
+        super().__setattr__(name, value)
 
     def __eq__(self, other):
         try:
-            a = vars(self)
-            b = vars(other)
+            a = self._attributes()
+            b = other._attributes()
         except Exception:
             return False
         return self._compareType(a, b)
 
     def __hash__(self):
-        return self.id
+        return self._hash
+
+    @cached_property
+    def _hash(self):
+        """Hash of the id, computed once as the id of a workitem doesn't change"""
+        return hash(self.id)
 
     def _compareType(self, a, b):
-        basic_types = [int, float,
-                       bool, type(None), str, datetime, date]
-
-        for key in a:
-            if key.startswith('_'):
-                # skip private types
-                continue
-            # first to a quick type compare to catch any easy differences
-            if type(a[key]) == type(b[key]):
-                if type(a[key]) in basic_types:
-                    # direct compare capable
-                    if a[key] != b[key]:
-                        return False
-                elif isinstance(a[key], list):
-                    # special case for list items
-                    if len(a[key]) != len(b[key]):
-                        return False
-                    for idx, sub_a in enumerate(a[key]):
-                        self._compareType(sub_a, b[key][idx])
-                else:
-                    if not self._compareType(a[key], b[key]):
-                        return False
-            else:
-                # exit, type mismatch
-                return False
-        # survived all exits, must be good then
-        return True
+        # private attributes are skipped, the others must be present in both
+        keys = [key for key in a if not key.startswith('_')]
+        if any(key not in b for key in keys):
+            return False
+        # zeep objects are converted to plain nested dicts and lists, so they can be compared in one go
+        return serialize_object({key: a[key] for key in keys}, dict) == \
+            serialize_object({key: b[key] for key in keys}, dict)
 
     def __repr__(self):
-        return f'{self._id}: {self._polarion_item.title}'
+        return f'{self.id}: {self._polarion_item.title}'
 
     def __str__(self):
-        return f'{self._id}: {self.title}'
+        return f'{self.id}: {self.title}'
 
 
 class WorkitemCreator(Creator):
@@ -1,3 +1,6 @@
+import copy
+import os
+import tempfile
 import unittest
 from polarion.polarion import Polarion
 from keys import polarion_user, polarion_password, polarion_url, polarion_project_id
@@ -75,6 +78,37 @@ class TestPolarionClient(unittest.TestCase):
         self.assertRaises(Exception, pol.getTypeFromService, 'made_up',
                           'dont care')
 
+    def test_renewing_service(self):
+        pol = Polarion(polarion_url, polarion_user, polarion_password)
+        service = pol.getRenewingService('Project')
+        self.assertIsNotNone(service.getUser(polarion_user))
+
+        # copies are made of workitems that hold the service
+        service = copy.copy(service)
+        self.assertIsNotNone(service.getUser(polarion_user))
+
+    def test_wsdl_cache(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache_file = os.path.join(cache_dir, 'polarion_wsdl_test.db')
+            with mock.patch.dict(os.environ, {'POLARION_WSDL_CACHE': cache_file}):
+                pol = Polarion(polarion_url, polarion_user, polarion_password)
+            self.assertTrue(os.path.exists(cache_file), msg='WSDL cache file not created')
+            self.assertGreater(len(pol.getService('Tracker').__dir__()), 10)
+
+        pol = Polarion(polarion_url, polarion_user, polarion_password, cache=False)
+        self.assertGreater(len(pol.getService('Tracker').__dir__()), 10)
+
+    def test_wsdl_cache_not_writable(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            # a file used as directory, the cache file can't be created
+            not_a_dir = os.path.join(cache_dir, 'not_a_dir')
+            open(not_a_dir, 'w').close()
+            cache_file = os.path.join(not_a_dir, 'polarion_wsdl_test.db')
+            with mock.patch.dict(os.environ, {'POLARION_WSDL_CACHE': cache_file}):
+                with self.assertLogs('polarion.polarion', level='WARNING'):
+                    pol = Polarion(polarion_url, polarion_user, polarion_password)
+            self.assertGreater(len(pol.getService('Tracker').__dir__()), 10)
+
     def test_string(self):
         pol = Polarion(polarion_url, polarion_user, polarion_password)
 
@@ -2,6 +2,8 @@ import unittest
 from unittest.mock import MagicMock
 from polarion.polarion import Polarion
 from polarion.project import Project
+from polarion.workitem import Workitem
+from polarion.base.custom_fields import PolarionAccessError
 from keys import polarion_user, polarion_password, polarion_url, polarion_project_id
 from time import sleep
 from datetime import datetime
@@ -258,6 +260,37 @@ class TestPolarionWorkitem(unittest.TestCase):
         self.assertEqual(executed_workitem, checking_workitem,
                          msg='Workitems not identical')
 
+    def test_workitem_hash(self):
+        checking_workitem = self.checking_project.getWorkitem(self.global_workitem.id)
+        self.assertEqual(hash(self.global_workitem), hash(checking_workitem), msg='Hashes not identical')
+        self.assertIn(checking_workitem, {self.global_workitem}, msg='Workitem not found in set')
+
+    def test_workitem_not_equal_in_list_field(self):
+        executed_workitem_1 = self.executing_project.createWorkitem('task')
+        executed_workitem_2 = self.executing_project.createWorkitem('task')
+        executed_workitem_3 = self.executing_project.createWorkitem('task')
+        executed_workitem_1.addLinkedItem(executed_workitem_2, 'relates_to')
+
+        checking_workitem_1 = self.checking_project.getWorkitem(executed_workitem_1.id)
+        checking_workitem_2 = self.checking_project.getWorkitem(executed_workitem_1.id)
+        self.assertEqual(checking_workitem_1, checking_workitem_2, msg='Workitems not identical')
+
+        # only the linked workitem inside the list differs
+        checking_workitem_2.linkedWorkItems.LinkedWorkItem[0].workItemURI = executed_workitem_3.uri
+        self.assertNotEqual(checking_workitem_1, checking_workitem_2, msg='Workitems with different links are equal')
+
+    def test_bulk_load(self):
+        executed_workitems = [self.executing_project.createWorkitem('task') for _ in range(3)]
+        ids = [workitem.id for workitem in executed_workitems]
+
+        loaded_workitems = Workitem.bulk_load(self.pol, self.checking_project, ids)
+        self.assertEqual(ids, [workitem.id for workitem in loaded_workitems], msg='Workitems not in the same order')
+        for executed_workitem, loaded_workitem in zip(executed_workitems, loaded_workitems):
+            self.assertEqual(executed_workitem, loaded_workitem, msg='Workitems not identical')
+
+        with self.assertRaises(PolarionAccessError):
+            Workitem.bulk_load(self.pol, self.checking_project, ids + ['made_up-1'])
+
     def test_workitem_creator(self):
         new_workitem = createFromUri(self.pol, self.executing_project, self.global_workitem.uri)
 
@@ -312,6 +345,18 @@ class TestPolarionWorkitem(unittest.TestCase):
         executed_workitem.setStatus(new_value)
         self.assertEqual(executed_workitem.status.id, new_value, msg="Workitem should have updated to new value")
 
+    def test_last_finalized(self):
+        executed_workitem = self.executing_project.createWorkitem('task')
+        self.assertIsNone(executed_workitem.getLastFinalized(), msg='New workitem already finalized')
+
+        if 'finalized' not in executed_workitem.getAvailableStatus():
+            self.skipTest('The finalized status is not available for a new task')
+        executed_workitem.setStatus('finalized')
+        self.assertEqual('finalized', executed_workitem.status.id, msg='Workitem not finalized')
+
+        checking_workitem = self.checking_project.getWorkitem(executed_workitem.id)
+        self.assertIsNotNone(checking_workitem.getLastFinalized(), msg='Finalized date not found in the history')
+
     def test_add_link(self):
         executed_workitem_1 = self.executing_project.createWorkitem('task')
         executed_workitem_2 = self.executing_project.createWorkitem('task')
@@ -510,6 +555,21 @@ class TestPolarionWorkitem(unittest.TestCase):
         self.assertEqual(url, executed_workitem_1.hyperlinks.Hyperlink[0].uri)
         self.assertEqual(url, checking_workitem_1.hyperlinks.Hyperlink[0].uri)
 
+    def test_revert_after_modification(self):
+        executed_workitem = self.executing_project.createWorkitem('task')
+        original_title = executed_workitem.title
+
+        # a modification made through the service marks the workitem for reload, revert must still drop the change
+        executed_workitem.addHyperlink('https://github.com/jesper-raemaekers/python-polarion',
+                                       executed_workitem.HyperlinkRoles.EXTERNAL_REF)
+        executed_workitem.title = 'reverted title'
+        executed_workitem.revert_changes()
+        executed_workitem.save()
+
+        checking_workitem = self.checking_project.getWorkitem(executed_workitem.id)
+        self.assertEqual(original_title, executed_workitem.title, msg='Title not reverted')
+        self.assertEqual(original_title, checking_workitem.title, msg='Reverted title saved')
+
 
     def test_testcase_column_names(self):
         executed_workitem_1 = self.executing_project.createWorkitem('testcase')
@@ -676,4 +736,19 @@ class TestPolarionWorkitem(unittest.TestCase):
         self.assertEqual('follow_up', executed_workitem_2.getLinkedItemWithRoles()[0][0],
                          msg='Check link type')
         self.assertEqual(executed_workitem_1, executed_workitem_2.getLinkedItem()[0],
-                         msg='Check workitem')
\ No newline at end of file
+                         msg='Check workitem')
+
+    def test_iterate_linked_items_prefetch(self):
+        executed_workitem_1 = self.executing_project.createWorkitem('task')
+        executed_workitem_2 = self.executing_project.createWorkitem('task')
+        executed_workitem_3 = self.executing_project.createWorkitem('task')
+        executed_workitem_1.addLinkedItem(executed_workitem_2, 'follow_up')
+        executed_workitem_1.addLinkedItem(executed_workitem_3, 'relates_to')
+
+        linked = list(executed_workitem_1.iterateLinkedWorkItems(prefetch=True))
+        self.assertEqual(2, len(linked), msg='Linked workitem not 2 in length')
+        self.assertIn(executed_workitem_2, linked, msg='Check workitem')
+        self.assertIn(executed_workitem_3, linked, msg='Check workitem')
+
+        linked = list(executed_workitem_1.iterateLinkedWorkItems(roles='follow_up', prefetch=True))
+        self.assertEqual([executed_workitem_2], linked, msg='Check workitem filtered by role')